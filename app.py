@@ -5,6 +5,12 @@ import os
 os.environ["PLAYWRIGHT_BROWSERS_PATH"] = "0"
 
 from playwright.sync_api import sync_playwright
+from browser_profile import (
+    normalize_cookies, block_heavy_resources,
+    profile_age_hours, profile_is_fresh, warm_profile,
+    new_profile_run_dir, cleanup_profile_run_dir, open_context,
+)
+from strategy_stats import load_strategy_stats, plan_strategies, commit_strategy_outcome
 import pandas as pd
 import time
 import json
@@ -118,9 +124,11 @@ def update_sheet_row(row_num, product_tag_status, product_title, price, platform
 # TOP-LEVEL WORKER — multiprocessing ke liye
 # ─────────────────────────────────────────────────────────────
 def _scrape_worker(args):
-    video_url, cookies = args
+    video_url, cookies, profile_run_dir = args
     local_results = []
     local_logs = []
+    strategy_stats = load_strategy_stats()
+    outcome = {}
     tag = f"[...{video_url[-12:]}]"
 
     def log(msg):
@@ -257,6 +265,96 @@ def _scrape_worker(args):
             pass
         return "Normal"
 
+    def detect_channel(page):
+        try:
+            return page.evaluate("""
+                () => {
+                    const a = document.querySelector(
+                        'ytd-watch-metadata ytd-channel-name a, #owner ytd-channel-name a, ' +
+                        'ytd-reel-player-overlay-renderer #channel-name a, ytd-reel-channel-bar-view-model a');
+                    const l = document.querySelector('span[itemprop="author"] link[itemprop="url"]');
+                    const href = (a && a.href) || (l && l.href) || '';
+                    // Sirf path rakho (/@handle) taaki dono selectors ka key same bane
+                    return href ? new URL(href, location.href).pathname.replace(/\/+$/, '') : '';
+                }
+            """) or ""
+        except Exception:
+            return ""
+
+    def has_products():
+        return any(r["Product_Tag_Status"] == "YES" for r in local_results)
+
+    # probe=True: channel pe skipped strategy, sirf sasta check (no scroll/click waits)
+    def run_panel(page, video_type, probe=False):
+        panel = page.locator("ytd-engagement-panel-section-list-renderer[target-id='engagement-panel-shopping']")
+        if panel.count() == 0 or not panel.first.is_visible():
+            return
+        cards = panel.first.locator("ytd-vertical-product-card-renderer, ytd-merch-item-renderer, ytd-grid-merch-item-renderer")
+        scrape_cards(cards, video_type)
+        if video_type == "Shorts" and not probe:
+            try:
+                panel.first.evaluate("(el) => el.scrollTop += 500")
+                page.wait_for_timeout(800)
+                scrape_cards(cards, video_type)
+            except Exception:
+                pass
+
+    def run_cards(page, video_type, probe=False):
+        scrape_cards(page.locator("ytd-merch-item-renderer, ytd-vertical-product-card-renderer, ytd-grid-merch-item-renderer"), video_type)
+
+    def run_price_text(page, video_type, probe=False):
+        # Slow fallback: ₹ text se card dhundo (Normal mein click + 1200ms wait bhi).
+        # Probe mein ₹ text hi nahi to turant return, warna sirf 2 candidates bina click ke.
+        normal = video_type == "Normal"
+        rp = page.locator("text=/₹\\s*[0-9]/")
+        try:
+            rc = rp.count()
+        except Exception:
+            rc = 0
+        limit = 2 if probe else (8 if normal else 6)
+        for idx in range(min(rc, limit)):
+            try:
+                pn = rp.nth(idx)
+                if not pn.is_visible():
+                    continue
+                if normal:
+                    pn.scroll_into_view_if_needed()
+                el = find_card_from_price(pn)
+                if not el:
+                    continue
+                if normal and not probe:
+                    try:
+                        el.click(timeout=2000, force=True)
+                        page.wait_for_timeout(1200)
+                    except Exception:
+                        pass
+                txt = el.inner_text()
+                price = extract_price(txt)
+                if price == "N/A":
+                    continue
+                add_row(video_type, extract_title(txt), price, card_link(el), txt)
+            except Exception:
+                continue
+
+    strategy_funcs = {"panel": run_panel, "cards": run_cards, "price_text": run_price_text}
+
+    def run_strategies(page, video_type):
+        channel = detect_channel(page)
+        planned, skipped = plan_strategies(strategy_stats, video_type, channel)
+        log(f"Strategies: {' → '.join(planned)}" + (f" (skipped: {', '.join(skipped)})" if skipped else ""))
+        outcome.clear()
+        outcome.update({"video_type": video_type, "channel": channel, "tried": [], "winner": None})
+        # Skipped wali aakhir mein sirf probe mode mein — galat NO nahi, par poora slow path bhi nahi
+        for name in planned + skipped:
+            if skipped and name == skipped[0]:
+                log("Planned strategies found nothing, probing skipped ones")
+            outcome["tried"].append(name)
+            strategy_funcs[name](page, video_type, probe=name in skipped)
+            if has_products():
+                outcome["winner"] = name
+                log(f"Strategy '{name}' ✓")
+                return
+
     def do_shorts(page):
         try:
             page.locator("video").first.wait_for(state="visible", timeout=8000)
@@ -281,42 +379,7 @@ def _scrape_worker(args):
         except Exception as e:
             log(f"Click failed: {e}")
 
-        panel = page.locator("ytd-engagement-panel-section-list-renderer[target-id='engagement-panel-shopping']")
-        if panel.count() > 0 and panel.first.is_visible():
-            cards = panel.first.locator("ytd-vertical-product-card-renderer, ytd-merch-item-renderer, ytd-grid-merch-item-renderer")
-            scrape_cards(cards, "Shorts")
-            try:
-                panel.first.evaluate("(el) => el.scrollTop += 500")
-                page.wait_for_timeout(800)
-                scrape_cards(cards, "Shorts")
-            except Exception:
-                pass
-            if any(r["Product_Tag_Status"] == "YES" for r in local_results):
-                return
-
-        scrape_cards(page.locator("ytd-vertical-product-card-renderer, ytd-merch-item-renderer, ytd-grid-merch-item-renderer"), "Shorts")
-
-        if not any(r["Product_Tag_Status"] == "YES" for r in local_results):
-            rp = page.locator("text=/₹\\s*[0-9]/")
-            try:
-                rc = rp.count()
-            except Exception:
-                rc = 0
-            for idx in range(min(rc, 6)):
-                try:
-                    pn = rp.nth(idx)
-                    if not pn.is_visible():
-                        continue
-                    el = find_card_from_price(pn)
-                    if not el:
-                        continue
-                    txt = el.inner_text()
-                    price = extract_price(txt)
-                    if price == "N/A":
-                        continue
-                    add_row("Shorts", extract_title(txt), price, card_link(el), txt)
-                except Exception:
-                    continue
+        run_strategies(page, "Shorts")
 
     def do_normal(page):
         try:
@@ -330,118 +393,76 @@ def _scrape_worker(args):
         except Exception:
             pass
 
-        panel = page.locator("ytd-engagement-panel-section-list-renderer[target-id='engagement-panel-shopping']")
-        if panel.count() > 0 and panel.first.is_visible():
-            scrape_cards(panel.first.locator("ytd-vertical-product-card-renderer, ytd-merch-item-renderer, ytd-grid-merch-item-renderer"), "Normal")
-
-        scrape_cards(page.locator("ytd-merch-item-renderer, ytd-vertical-product-card-renderer, ytd-grid-merch-item-renderer"), "Normal")
+        run_strategies(page, "Normal")
 
-        if any(r["Product_Tag_Status"] == "YES" for r in local_results):
-            return
-
-        rp = page.locator("text=/₹\\s*[0-9]/")
+    with sync_playwright() as p:
+        # Warm profile read-only hai — har worker process run mein ek baar apni copy banata hai
+        browser, context, warmed = open_context(p, profile_run_dir)
+        log("Using warmed profile" if warmed else "Cold browser context")
         try:
-            rc = rp.count()
-        except Exception:
-            rc = 0
-        for idx in range(min(rc, 8)):
-            try:
-                pn = rp.nth(idx)
-                if not pn.is_visible():
-                    continue
-                pn.scroll_into_view_if_needed()
-                el = find_card_from_price(pn)
-                if not el:
-                    continue
+            if cookies:
                 try:
-                    el.click(timeout=2000, force=True)
-                    page.wait_for_timeout(1200)
-                except Exception:
-                    pass
-                txt = el.inner_text()
-                price = extract_price(txt)
-                if price == "N/A":
-                    continue
-                add_row("Normal", extract_title(txt), price, card_link(el), txt)
-            except Exception:
-                continue
+                    context.add_cookies(normalize_cookies(cookies))
+                except Exception as e:
+                    log(f"Cookie error: {e}")
+
+            max_retries = 2
+            for attempt in range(1, max_retries + 1):
+                local_results.clear()
+                outcome.clear()
+                page = context.new_page()
+                if not warmed:
+                    block_heavy_resources(page)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36",
-            viewport={"width": 1920, "height": 1080},
-        )
-        if cookies:
-            try:
-                cleaned = []
-                for c in cookies:
-                    ck = c.copy()
-                    if ck.get('sameSite') not in ['Strict', 'Lax', 'None']:
-                        ck.pop('sameSite', None)
-                    for k in ('hostOnly', 'session', 'storeId'):
-                        ck.pop(k, None)
-                    cleaned.append(ck)
-                context.add_cookies(cleaned)
-            except Exception as e:
-                log(f"Cookie error: {e}")
-
-        max_retries = 2
-        for attempt in range(1, max_retries + 1):
-            local_results.clear()
-            page = context.new_page()
-            page.route("**/*", lambda route: route.abort()
-                if route.request.resource_type in ["image", "media", "font"]
-                else route.continue_()
-            )
-
-            try:
-                log(f"Navigating (Attempt {attempt}/{max_retries})...")
-                page.goto(video_url, wait_until="networkidle", timeout=60000)
-                
-                # Dynamic wait: wait for the engagement panel to attach to DOM, or fallback
                 try:
-                    page.wait_for_selector("ytd-engagement-panel-section-list-renderer, ytd-merch-shelf-renderer", timeout=5000)
-                except Exception:
-                    # Fallback wait if it truly is a page without shopping
-                    page.wait_for_timeout(3000)
-
-                vtype = detect_type(page)
-                log(f"Type: {vtype}")
-
-                if vtype == "Shorts":
-                    do_shorts(page)
-                else:
-                    do_normal(page)
-
-                if local_results:
-                    log(f"→ {len(local_results)} product(s) ✓")
-                    page.close()
-                    break # Success, exit retry loop
-                else:
-                    log("→ NO products found this attempt")
+                    log(f"Navigating (Attempt {attempt}/{max_retries})...")
+                    page.goto(video_url, wait_until="networkidle", timeout=60000)
+                
+                    # Dynamic wait: wait for the engagement panel to attach to DOM, or fallback
+                    try:
+                        page.wait_for_selector("ytd-engagement-panel-section-list-renderer, ytd-merch-shelf-renderer", timeout=5000)
+                    except Exception:
+                        # Fallback wait if it truly is a page without shopping
+                        page.wait_for_timeout(3000)
+
+                    vtype = detect_type(page)
+                    log(f"Type: {vtype}")
+
+                    if vtype == "Shorts":
+                        do_shorts(page)
+                    else:
+                        do_normal(page)
+
+                    if local_results:
+                        log(f"→ {len(local_results)} product(s) ✓")
+                        page.close()
+                        break # Success, exit retry loop
+                    else:
+                        log("→ NO products found this attempt")
+                        if attempt == max_retries:
+                            local_results.append({
+                                "Source URL": video_url, "Video_Type": vtype,
+                                "Product_Tag_Status": "NO",
+                                "Title": "", "Price": "", "Platform": "", "Link": "",
+                            })
+
+                except Exception as e:
+                    log(f"Error on attempt {attempt}: {e}")
                     if attempt == max_retries:
                         local_results.append({
-                            "Source URL": video_url, "Video_Type": vtype,
-                            "Product_Tag_Status": "NO",
-                            "Title": "", "Price": "", "Platform": "", "Link": "",
+                            "Source URL": video_url, "Video_Type": "Unknown",
+                            "Product_Tag_Status": "ERROR",
+                            "Title": str(e), "Price": "", "Platform": "", "Link": "",
                         })
+                finally:
+                    page.close()
 
-            except Exception as e:
-                log(f"Error on attempt {attempt}: {e}")
-                if attempt == max_retries:
-                    local_results.append({
-                        "Source URL": video_url, "Video_Type": "Unknown",
-                        "Product_Tag_Status": "ERROR",
-                        "Title": str(e), "Price": "", "Platform": "", "Link": "",
-                    })
-            finally:
-                page.close()
-
-        context.close()
-        browser.close()
+        finally:
+            context.close()
+            if browser:
+                browser.close()
 
-    return local_results, local_logs
+    return local_results, local_logs, outcome
 
 
 # ─────────────────────────────────────────────────────────────
@@ -458,12 +479,17 @@ def scrape_youtube_products(video_urls, log_placeholder, cookies=None, max_worke
     all_logs.append(f"[{time.strftime('%H:%M:%S')}] Starting: {len(clean_urls)} URLs | {max_workers} workers")
     refresh_log()
 
-    args = [(url, cookies) for url in clean_urls]
-    with Pool(processes=max_workers) as pool:
-        for results, logs in pool.imap_unordered(_scrape_worker, args):
-            all_products.extend(results)
-            all_logs.extend(logs)
-            refresh_log()
+    profile_run_dir = new_profile_run_dir()
+    args = [(url, cookies, profile_run_dir) for url in clean_urls]
+    try:
+        with Pool(processes=max_workers) as pool:
+            for results, logs, outcome in pool.imap_unordered(_scrape_worker, args):
+                all_products.extend(results)
+                all_logs.extend(logs)
+                commit_strategy_outcome(outcome)
+                refresh_log()
+    finally:
+        cleanup_profile_run_dir(profile_run_dir)
 
     all_logs.append(f"[{time.strftime('%H:%M:%S')}] Done. Total rows: {len(all_products)}")
     refresh_log()
@@ -514,9 +540,12 @@ def run_cron_job(progress_bar=None, log_container=None):
         pass
 
     urls_only = [url for _, url in urls_with_rows]
+    if not profile_is_fresh():
+        warm_profile()
     row_map = {url: row_num for row_num, url in urls_with_rows}
 
-    args = [(url, None) for url in urls_only]
+    profile_run_dir = new_profile_run_dir()
+    args = [(url, None, profile_run_dir) for url in urls_only]
 
     # Scrape karo (Sequentially on Render to avoid OOM crashes)
     total_to_process = len(args)
@@ -526,56 +555,60 @@ def run_cron_job(progress_bar=None, log_container=None):
     # UI Live Logs Tracker
     live_logs = []
     
-    for idx, arg in enumerate(args):
-        url = arg[0]
-        row_num = row_map[url]
-        try:
-            results, logs = _scrape_worker(arg)
-            for log_line in logs:
-                print(f"[CRON] {log_line}")
-                if log_container:
-                    live_logs.append(log_line)
-                    # Show only last 20 lines to prevent UI freezing
-                    log_container.code("\n".join(live_logs[-20:]), language="text")
-
-            # --- INSTANT GOOGLE SHEET UPDATE ---
-            if not results:
-                update_sheet_row(row_num, "NO", "", "", "")
-                have_no_product += 1
-            else:
-                first = results[0]
-                status = first["Product_Tag_Status"]
-                update_sheet_row(
-                    row_num,
-                    status,
-                    first.get("Title", ""),
-                    first.get("Price", ""),
-                    first.get("Platform", ""),
-                )
-                if status == "YES":
-                    updated_with_product += 1
-                else:
+    try:
+        for idx, arg in enumerate(args):
+            url = arg[0]
+            row_num = row_map[url]
+            try:
+                results, logs, outcome = _scrape_worker(arg)
+                commit_strategy_outcome(outcome)
+                for log_line in logs:
+                    print(f"[CRON] {log_line}")
+                    if log_container:
+                        live_logs.append(log_line)
+                        # Show only last 20 lines to prevent UI freezing
+                        log_container.code("\n".join(live_logs[-20:]), language="text")
+
+                # --- INSTANT GOOGLE SHEET UPDATE ---
+                if not results:
+                    update_sheet_row(row_num, "NO", "", "", "")
                     have_no_product += 1
-            print(f"[CRON] Updated row {row_num} for {url[-30:]}")
+                else:
+                    first = results[0]
+                    status = first["Product_Tag_Status"]
+                    update_sheet_row(
+                        row_num,
+                        status,
+                        first.get("Title", ""),
+                        first.get("Price", ""),
+                        first.get("Platform", ""),
+                    )
+                    if status == "YES":
+                        updated_with_product += 1
+                    else:
+                        have_no_product += 1
+                print(f"[CRON] Updated row {row_num} for {url[-30:]}")
 
-        except Exception as e:
-            err_msg = f"[CRON] Error processing {url}: {e}"
-            print(err_msg)
-            if log_container:
-                live_logs.append(err_msg)
-                log_container.code("\n".join(live_logs[-20:]), language="text")
+            except Exception as e:
+                err_msg = f"[CRON] Error processing {url}: {e}"
+                print(err_msg)
+                if log_container:
+                    live_logs.append(err_msg)
+                    log_container.code("\n".join(live_logs[-20:]), language="text")
                 
-        # Update progress bar
-        if progress_bar:
-            progress = (idx + 1) / total_to_process
-            progress_bar.progress(progress)
+            # Update progress bar
+            if progress_bar:
+                progress = (idx + 1) / total_to_process
+                progress_bar.progress(progress)
             
-        # Update text file to act as a heartbeat
-        try:
-            with open("cron_status.txt", "w") as f:
-                f.write(f"Running ({idx + 1}/{total_to_process} URLs processed) - Started {start_str}")
-        except Exception:
-            pass
+            # Update text file to act as a heartbeat
+            try:
+                with open("cron_status.txt", "w") as f:
+                    f.write(f"Running ({idx + 1}/{total_to_process} URLs processed) - Started {start_str}")
+            except Exception:
+                pass
+    finally:
+        cleanup_profile_run_dir(profile_run_dir)
 
     end_time = datetime.datetime.now()
     log_cron_run(start_time, end_time, total_rows, updated_with_product, already_done_count, have_no_product)
@@ -602,6 +635,13 @@ if "scheduler_started" not in st.session_state:
         minute=0,
         timezone="Asia/Kolkata",   # IST
     )
+    scheduler.add_job(
+        warm_profile,
+        trigger="cron",
+        hour="5,17",
+        minute=30,
+        timezone="Asia/Kolkata",   # cron se pehle profile fresh
+    )
     scheduler.start()
     st.session_state.scheduler_started = True
     print("[SCHEDULER] Cron job scheduled for 6:00 AM and 6:00 PM IST daily")
@@ -653,6 +693,25 @@ with st.expander("Advanced Settings"):
         "Parallel Workers (zyada = fast, RAM zyada lagegi)",
         min_value=1, max_value=10, value=2
     )
+    age = profile_age_hours()
+    st.caption(
+        f"Warm browser profile: {age:.1f}h old" + ("" if profile_is_fresh() else " (stale)")
+        if age is not None else "Warm browser profile: not created yet"
+    )
+    if st.button("🔥 Warm Browser Profile"):
+        warm_cookies = None
+        if cookies_json:
+            try:
+                warm_cookies = json.loads(cookies_json)
+            except Exception as e:
+                st.error(f"Invalid JSON: {e}")
+                st.stop()
+        with st.spinner("Warming browser profile..."):
+            ok = warm_profile(cookies=warm_cookies)
+        if ok:
+            st.success("Browser profile warmed.")
+        else:
+            st.error("Profile warm failed — check logs.")
 
 if st.button("Start Scraping"):
     urls = [u.strip() for u in urls_input.split('\n') if u.strip()]
@@ -0,0 +1,217 @@
+import os
+import time
+import fnmatch
+import shutil
+import tempfile
+import datetime
+
+from playwright.sync_api import sync_playwright
+
+
+# ─────────────────────────────────────────────────────────────
+# WARM BROWSER PROFILE — consent/cookies/cache ek baar, sab workers reuse karein
+# ─────────────────────────────────────────────────────────────
+PROFILE_DIR            = "yt_profile"
+PROFILE_STAMP_FILE     = "warmed_at.txt"
+PROFILE_RUN_PREFIX     = "yt_profile_run_"
+PROFILE_MAX_AGE_HOURS  = 12
+# Local stand-in server se test karne ke liye override karo
+PROFILE_WARM_URL       = os.environ.get("PROFILE_WARM_URL", "https://www.youtube.com/")
+# Koi bhi watch page — player JS sab videos mein same hai, isse cache ho jaata hai
+PROFILE_WARM_VIDEO_URL = os.environ.get("PROFILE_WARM_VIDEO_URL", "https://www.youtube.com/watch?v=jNQXAC9IVRw")
+
+BROWSER_CONTEXT_ARGS = {
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36",
+    "viewport": {"width": 1920, "height": 1080},
+}
+
+# Warm profile mode mein page.route() nahi lagate — Playwright routing on hote hi
+# HTTP cache band kar deta hai. Images/autoplay ko Chromium flags se rokte hain.
+WARM_PROFILE_LAUNCH_ARGS = [
+    "--blink-settings=imagesEnabled=false",
+    "--autoplay-policy=user-gesture-required",
+    "--disk-cache-size=52428800",   # HTTP cache 50 MB tak — per-run copy chhota rahe
+]
+
+# Profile mein sirf cookies/consent (Cookies, Local Storage) aur static asset cache
+# (Cache, Code Cache, Service Worker scripts) chahiye. Baaki sab har warm pe hata do,
+# aur lock files kabhi copy nahi karne.
+PROFILE_TRIM_PATTERNS = [
+    "Singleton*", "*.lock", "lockfile",
+    "GPUCache", "ShaderCache", "GrShaderCache", "GraphiteDawnCache", "DawnCache",
+    "CacheStorage", "IndexedDB", "File System", "blob_storage", "Session Storage",
+    "Sessions", "History*", "Visited Links", "Top Sites*", "Favicons*",
+    "Crashpad", "BrowserMetrics*", "*.pma", "optimization_guide*",
+]
+
+CONSENT_SELECTORS = [
+    "button:has-text('Accept all')",
+    "button:has-text('I agree')",
+    "form[action*='consent'] button",
+    "tp-yt-paper-button[aria-label*='Accept']",
+]
+
+
+def normalize_cookies(cookies):
+    """Browser extension se paste kiye cookies ko Playwright format mein saaf karo."""
+    cleaned = []
+    for c in cookies or []:
+        ck = c.copy()
+        if ck.get('sameSite') not in ['Strict', 'Lax', 'None']:
+            ck.pop('sameSite', None)
+        for k in ('hostOnly', 'session', 'storeId'):
+            ck.pop(k, None)
+        cleaned.append(ck)
+    return cleaned
+
+
+def block_heavy_resources(page):
+    # Sirf cold mode ke liye — routing se HTTP cache disable ho jata hai
+    page.route("**/*", lambda route: route.abort()
+        if route.request.resource_type in ["image", "media", "font"]
+        else route.continue_()
+    )
+
+
+def profile_age_hours():
+    try:
+        with open(os.path.join(PROFILE_DIR, PROFILE_STAMP_FILE), "r") as f:
+            warmed_at = float(f.read().strip())
+        return (time.time() - warmed_at) / 3600
+    except Exception:
+        return None
+
+
+def profile_is_fresh():
+    age = profile_age_hours()
+    return age is not None and age < PROFILE_MAX_AGE_HOURS
+
+
+def copy_profile(src, dst):
+    # Lock files copy hue to copy wala profile launch nahi hota; trim wali cheezein bhi skip
+    shutil.copytree(src, dst, dirs_exist_ok=True, ignore=shutil.ignore_patterns(*PROFILE_TRIM_PATTERNS))
+
+
+def trim_profile(path):
+    """Warm ke baad profile se woh sab hatao jo PROFILE_TRIM_PATTERNS mein hai."""
+    for root, dirs, files in os.walk(path):
+        for name in list(dirs):
+            if any(fnmatch.fnmatch(name, pat) for pat in PROFILE_TRIM_PATTERNS):
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+                dirs.remove(name)
+        for name in files:
+            if any(fnmatch.fnmatch(name, pat) for pat in PROFILE_TRIM_PATTERNS):
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    pass
+
+
+def accept_consent(page):
+    for sel in CONSENT_SELECTORS:
+        try:
+            btn = page.locator(sel)
+            if btn.count() > 0 and btn.first.is_visible():
+                btn.first.click(timeout=3000)
+                page.wait_for_load_state("networkidle", timeout=15000)
+                return True
+        except Exception:
+            continue
+    return False
+
+
+def warm_profile(cookies=None, urls=None, raise_errors=False):
+    """Staging dir mein profile warm karo (consent accept, cookies, cached JS), phir PROFILE_DIR se swap.
+    Purana profile base ki tarah use hota hai taaki pehle ke cookies/cache bane rahein."""
+    urls = urls or [PROFILE_WARM_URL, PROFILE_WARM_VIDEO_URL]
+    parent = os.path.dirname(os.path.abspath(PROFILE_DIR))
+    staging = tempfile.mkdtemp(prefix="yt_profile_warm_", dir=parent)
+    try:
+        if os.path.isdir(PROFILE_DIR):
+            copy_profile(PROFILE_DIR, staging)
+        with sync_playwright() as p:
+            context = p.chromium.launch_persistent_context(
+                staging, headless=True, args=WARM_PROFILE_LAUNCH_ARGS, **BROWSER_CONTEXT_ARGS
+            )
+            try:
+                if cookies:
+                    context.add_cookies(normalize_cookies(cookies))
+                page = context.pages[0] if context.pages else context.new_page()
+                for url in urls:
+                    page.goto(url, wait_until="networkidle", timeout=60000)
+                    if accept_consent(page):
+                        print(f"[PROFILE] Consent accepted on {url}")
+            finally:
+                context.close()
+
+        trim_profile(staging)
+        with open(os.path.join(staging, PROFILE_STAMP_FILE), "w") as f:
+            f.write(str(time.time()))
+
+        old = None
+        if os.path.isdir(PROFILE_DIR):
+            old = tempfile.mkdtemp(prefix="yt_profile_old_", dir=parent)
+            os.rmdir(old)
+            os.replace(PROFILE_DIR, old)
+        os.replace(staging, PROFILE_DIR)
+        staging = None
+        if old:
+            shutil.rmtree(old, ignore_errors=True)
+        print(f"[PROFILE] Warmed at {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return True
+    except Exception as e:
+        print(f"[PROFILE ERROR] Could not warm profile: {e}")
+        if raise_errors:
+            raise
+        return False
+    finally:
+        if staging:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def new_profile_run_dir():
+    """Ek scrape run ke liye dir — har worker process isme apni ek copy banata hai.
+    Profile fresh nahi hai to None (workers cold start karenge)."""
+    if not profile_is_fresh():
+        return None
+    return tempfile.mkdtemp(prefix=PROFILE_RUN_PREFIX)
+
+
+def cleanup_profile_run_dir(run_dir):
+    if run_dir:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def process_profile_copy(run_dir):
+    """Is process ki profile copy (run ke andar pehli URL pe bani, baaki URLs reuse karein)."""
+    path = os.path.join(run_dir, str(os.getpid()))
+    if os.path.isdir(path):
+        return path
+    partial = path + ".partial"
+    try:
+        copy_profile(PROFILE_DIR, partial)
+        os.replace(partial, path)
+        return path
+    except Exception:
+        shutil.rmtree(partial, ignore_errors=True)
+        return None
+
+
+def open_context(p, run_dir=None):
+    """(browser, context, warmed) — warm profile copy mili to persistent context, warna cold.
+    Persistent context mein browser None hota hai."""
+    profile = process_profile_copy(run_dir) if run_dir else None
+    if profile:
+        try:
+            context = p.chromium.launch_persistent_context(
+                profile, headless=True, args=WARM_PROFILE_LAUNCH_ARGS, **BROWSER_CONTEXT_ARGS
+            )
+            return None, context, True
+        except Exception as e:
+            print(f"[PROFILE] Warm profile launch failed, cold start: {e}")
+    browser = p.chromium.launch(headless=True)
+    try:
+        return browser, browser.new_context(**BROWSER_CONTEXT_ARGS), False
+    except Exception:
+        browser.close()
+        raise
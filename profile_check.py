@@ -0,0 +1,178 @@
+"""Warm browser profile ko local stand-in server pe check + benchmark karo.
+
+Fake "YouTube" serve karta hai: consent interstitial (Accept all → CONSENT cookie),
+aur /watch page jo ek slow, cacheable player.js load karta hai. Phir:
+  1. warm_profile() chalao, stamp file + CONSENT cookie assert karo
+  2. cold context vs warmed profile copy ka per-URL load time compare karo
+  3. stale profile pe cold-start fallback assert karo
+
+Usage:  python profile_check.py [--runs 5]
+"""
+import os
+import sys
+import time
+import fnmatch
+import argparse
+import tempfile
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# app.py jaisa hi — setup.sh Chromium project directory mein install karta hai
+os.environ["PLAYWRIGHT_BROWSERS_PATH"] = "0"
+
+from playwright.sync_api import sync_playwright
+
+import browser_profile
+
+
+PLAYER_JS = ("/* fake player */\n" + "var x = 0;\n" * 150000).encode()
+PLAYER_JS_DELAY = 0.5   # seconds — slow CDN jaisa
+hits = {"player.js": 0, "consent_page": 0}
+
+
+class FakeYouTube(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, body, ctype="text/html", headers=None):
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _has_consent(self):
+        return "CONSENT=YES" in (self.headers.get("Cookie") or "")
+
+    def do_GET(self):
+        if self.path.startswith("/static/player.js"):
+            hits["player.js"] += 1
+            time.sleep(PLAYER_JS_DELAY)
+            self._send(200, PLAYER_JS, "application/javascript", {"Cache-Control": "public, max-age=86400"})
+            return
+        if not self._has_consent():
+            hits["consent_page"] += 1
+            page = (
+                "<html><body><h1>Before you continue</h1>"
+                "<form action='/consent' method='post'><input type='hidden' name='continue' value='%s'>"
+                "<button>Accept all</button></form></body></html>" % self.path
+            )
+            self._send(200, page.encode())
+            return
+        page = (
+            "<html><head><script src='/static/player.js'></script></head>"
+            "<body><ytd-watch-flexy id='ready'>%s</ytd-watch-flexy></body></html>" % self.path
+        )
+        self._send(200, page.encode())
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = urllib.parse.parse_qs(self.rfile.read(length).decode())
+        target = form.get("continue", ["/"])[0]
+        self._send(303, b"", headers={"Location": target, "Set-Cookie": "CONSENT=YES+1; Path=/; Max-Age=31536000"})
+
+
+def timed_load(context, url, warmed):
+    page = context.new_page()
+    if not warmed:
+        browser_profile.block_heavy_resources(page)
+    try:
+        start = time.time()
+        page.goto(url, wait_until="load", timeout=30000)
+        if page.locator("form[action*='consent']").count() > 0:
+            browser_profile.accept_consent(page)
+        page.wait_for_selector("#ready", timeout=30000)
+        return time.time() - start
+    finally:
+        page.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    opts = ap.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeYouTube)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    watch = f"{base}/watch?v=test"
+
+    workdir = tempfile.mkdtemp(prefix="profile_check_")
+    try:
+        browser_profile.PROFILE_DIR = os.path.join(workdir, "yt_profile")
+
+        # 1. Warm
+        assert not browser_profile.profile_is_fresh(), "profile should not exist yet"
+        # raise_errors: launch/navigation ki asli error dikhe, sirf "warm_profile failed" nahi
+        browser_profile.warm_profile(urls=[f"{base}/", watch], raise_errors=True)
+        assert os.path.exists(os.path.join(browser_profile.PROFILE_DIR, browser_profile.PROFILE_STAMP_FILE)), "stamp file missing"
+        assert browser_profile.profile_is_fresh(), "profile should be fresh after warm"
+        assert not [d for d in os.listdir(workdir) if d.startswith("yt_profile_")], "staging dirs left behind"
+        trimmed = [
+            os.path.join(root, n) for root, dirs, files in os.walk(browser_profile.PROFILE_DIR) for n in dirs + files
+            if any(fnmatch.fnmatch(n, pat) for pat in browser_profile.PROFILE_TRIM_PATTERNS)
+        ]
+        assert not trimmed, f"profile not trimmed: {trimmed[:5]}"
+        warm_js_hits = hits["player.js"]
+        print(f"[OK] warmed: stamp present, player.js fetched {warm_js_hits}x during warm")
+
+        with sync_playwright() as p:
+            run_dir = browser_profile.new_profile_run_dir()
+            browser, context, warmed = browser_profile.open_context(p, run_dir)
+            try:
+                assert warmed, "expected warmed persistent context"
+                names = {c["name"] for c in context.cookies(base)}
+                assert "CONSENT" in names, f"CONSENT cookie missing, got {names}"
+            finally:
+                context.close()
+            print("[OK] CONSENT cookie present in warmed profile copy")
+
+            # 2. Benchmark — har URL naya browser/context, jaise _scrape_worker karta hai
+            cold_times, warm_times = [], []
+            for _ in range(opts.runs):
+                browser, context, warmed = browser_profile.open_context(p, None)
+                try:
+                    cold_times.append(timed_load(context, watch, warmed))
+                finally:
+                    context.close()
+                    browser.close()
+
+            consent_before, js_before = hits["consent_page"], hits["player.js"]
+            for _ in range(opts.runs):
+                browser, context, warmed = browser_profile.open_context(p, run_dir)
+                try:
+                    assert warmed
+                    warm_times.append(timed_load(context, watch, warmed))
+                finally:
+                    context.close()
+            browser_profile.cleanup_profile_run_dir(run_dir)
+            assert hits["consent_page"] == consent_before, "warmed profile hit the consent interstitial"
+            print(f"[OK] warmed runs: consent page 0x, player.js fetched {hits['player.js'] - js_before}x over {opts.runs} loads")
+
+            cold_avg = sum(cold_times) / len(cold_times)
+            warm_avg = sum(warm_times) / len(warm_times)
+            print(f"cold  per-URL load: {cold_avg * 1000:.0f} ms (avg of {opts.runs})")
+            print(f"warm  per-URL load: {warm_avg * 1000:.0f} ms (avg of {opts.runs})")
+            assert warm_avg < cold_avg, "warmed profile was not faster"
+
+            # 3. Stale profile → cold fallback
+            browser_profile.PROFILE_MAX_AGE_HOURS = 0
+            assert browser_profile.new_profile_run_dir() is None, "stale profile should not produce a run dir"
+            browser, context, warmed = browser_profile.open_context(p, None)
+            try:
+                assert not warmed and browser is not None
+            finally:
+                context.close()
+                browser.close()
+            print("[OK] stale profile falls back to cold context")
+    finally:
+        server.shutdown()
+        browser_profile.cleanup_profile_run_dir(workdir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
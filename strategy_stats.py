@@ -0,0 +1,117 @@
+import os
+import json
+import random
+import threading
+
+
+# ─────────────────────────────────────────────────────────────
+# STRATEGY STATS — har channel / video type ke liye kaunsi strategy chalti hai
+# ─────────────────────────────────────────────────────────────
+STRATEGY_STATS_FILE    = "strategy_stats.json"
+STRATEGIES             = ("panel", "cards", "price_text")   # sasti → mehengi
+STRATEGY_MAX_FAILS     = 3     # channel pe itni baar lagataar fail → skip
+STRATEGY_MIN_WIN_RATE  = 0.5   # isse upar wali strategies cost order mein chalti hain
+STRATEGY_EXPLORE_RATE  = 0.1   # kabhi kabhi sasti strategy leader se pehle / skipped ko phir try
+
+_strategy_stats_lock = threading.Lock()
+
+
+def strategy_key(video_type, channel=""):
+    return f"{video_type}:{channel or '*'}"
+
+
+def load_strategy_stats():
+    try:
+        with open(STRATEGY_STATS_FILE, "r") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_strategy_stats(stats):
+    tmp = STRATEGY_STATS_FILE + ".tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(stats, f, indent=2)
+        os.replace(tmp, STRATEGY_STATS_FILE)
+    except Exception as e:
+        print(f"[STRATEGY STATS ERROR] Could not save: {e}")
+
+
+def win_rate(s):
+    # Laplace smoothing: kabhi try nahi hui strategy = 0.5
+    wins = s.get("wins", 0)
+    return (wins + 1) / (wins + s.get("fails", 0) + 2)
+
+
+def plan_strategies(stats, video_type, channel=""):
+    """(planned, skipped) strategies.
+
+    Jin strategies ka win rate STRATEGY_MIN_WIN_RATE ya usse zyada hai (ya kabhi try nahi hui)
+    woh cost order mein pehle chalti hain, baaki win rate ke hisaab se baad mein — ek mehengi
+    strategy ki jeet sasti wali ko hamesha ke liye peeche nahi dhakelti. Exploration mein ek
+    sasti strategy leader se pehle try hoti hai. Skip sirf channel ki apni fail streak pe hota
+    hai; type-level entry saare channels ka mix hai, usse sirf order decide hota hai.
+    """
+    channel_entry = stats.get(strategy_key(video_type, channel), {}) if channel else {}
+    type_entry = stats.get(strategy_key(video_type), {})
+    entry = channel_entry or type_entry
+
+    rates = {name: win_rate(entry.get(name, {})) for name in STRATEGIES}
+    viable = [name for name in STRATEGIES if rates[name] >= STRATEGY_MIN_WIN_RATE]
+    rest = sorted((name for name in STRATEGIES if name not in viable), key=lambda n: rates[n], reverse=True)
+    ordered = viable + rest
+
+    explored = None
+    if random.random() < STRATEGY_EXPLORE_RATE:
+        cheaper = STRATEGIES[:STRATEGIES.index(ordered[0])]
+        if cheaper:
+            explored = random.choice(cheaper)
+            ordered.remove(explored)
+            ordered.insert(0, explored)
+
+    planned, skipped = [], []
+    for name in ordered:
+        streak = channel_entry.get(name, {}).get("fail_streak", 0)
+        if name == explored or streak < STRATEGY_MAX_FAILS or random.random() < STRATEGY_EXPLORE_RATE:
+            planned.append(name)
+        else:
+            skipped.append(name)
+    return planned, skipped
+
+
+def record_strategy_outcome(stats, outcome):
+    """Worker ka outcome stats mein likho. Sirf un videos ko count karo jahan koi strategy chali —
+    bina products wali video se kisi strategy ko penalty nahi milni chahiye."""
+    if not outcome or not outcome.get("winner"):
+        return
+    winner = outcome["winner"]
+    if outcome.get("channel"):
+        entry = stats.setdefault(strategy_key(outcome["video_type"], outcome["channel"]), {})
+        for name in outcome["tried"]:
+            s = entry.setdefault(name, {"wins": 0, "fails": 0, "fail_streak": 0})
+            if name == winner:
+                s["wins"] += 1
+                s["fail_streak"] = 0
+            else:
+                s["fails"] += 1
+                s["fail_streak"] += 1
+    # Type-level entry: sirf wins/fails (win rate ke liye), fail streak nahi — skip yahan se nahi hota
+    type_entry = stats.setdefault(strategy_key(outcome["video_type"]), {})
+    for name in outcome["tried"]:
+        s = type_entry.setdefault(name, {"wins": 0, "fails": 0})
+        if name == winner:
+            s["wins"] = s.get("wins", 0) + 1
+        else:
+            s["fails"] = s.get("fails", 0) + 1
+
+
+def commit_strategy_outcome(outcome):
+    """Latest file reload karke merge + save, lock ke andar — cron aur manual scrape
+    ek hi process mein saath chal sakte hain, snapshot overwrite nahi hona chahiye."""
+    if not outcome or not outcome.get("winner"):
+        return
+    with _strategy_stats_lock:
+        stats = load_strategy_stats()
+        record_strategy_outcome(stats, outcome)
+        save_strategy_stats(stats)
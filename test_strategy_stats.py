@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+import strategy_stats as ss
+
+
+def win(stats, video_type, channel, tried, winner):
+    ss.record_strategy_outcome(stats, {"video_type": video_type, "channel": channel, "tried": tried, "winner": winner})
+
+
+@pytest.fixture
+def no_explore(monkeypatch):
+    monkeypatch.setattr(ss.random, "random", lambda: 0.99)
+
+
+@pytest.fixture
+def always_explore(monkeypatch):
+    monkeypatch.setattr(ss.random, "random", lambda: 0.0)
+    monkeypatch.setattr(ss.random, "choice", lambda seq: seq[0])
+
+
+def test_no_history_runs_cost_order(no_explore):
+    assert ss.plan_strategies({}, "Normal", "/@a") == (["panel", "cards", "price_text"], [])
+
+
+def test_viable_strategies_stay_in_cost_order(no_explore):
+    stats = {}
+    for _ in range(10):
+        win(stats, "Normal", "/@a", ["price_text"], "price_text")
+    win(stats, "Normal", "/@a", ["panel"], "panel")
+    planned, _ = ss.plan_strategies(stats, "Normal", "/@a")
+    assert planned[0] == "panel"
+
+
+def test_one_slow_win_does_not_lock_channel(always_explore):
+    stats = {}
+    win(stats, "Normal", "/@a", ["panel", "cards", "price_text"], "price_text")
+    # Exploration sasti strategy ko leader se pehle laata hai
+    planned, skipped = ss.plan_strategies(stats, "Normal", "/@a")
+    assert planned[0] == "panel" and not skipped
+
+
+def test_price_text_leader_recovers_once_panel_wins_again(monkeypatch):
+    # Reviewer scenario: panel ek baar slow tha, price_text jeeta; baad mein panel kaam karta hai
+    random.seed(7)
+    stats = {}
+    win(stats, "Normal", "/@a", ["panel", "cards", "price_text"], "price_text")
+    for _ in range(50):
+        planned, _ = ss.plan_strategies(stats, "Normal", "/@a")
+        winner = "panel" if "panel" in planned else planned[0]
+        win(stats, "Normal", "/@a", planned[:planned.index(winner) + 1], winner)
+    monkeypatch.setattr(ss.random, "random", lambda: 0.99)
+    assert ss.plan_strategies(stats, "Normal", "/@a")[0][0] == "panel"
+    assert ss.plan_strategies(stats, "Normal", "/@new")[0][0] == "panel"
+
+
+def test_channel_fail_streak_skips(no_explore):
+    stats = {}
+    for _ in range(ss.STRATEGY_MAX_FAILS):
+        win(stats, "Normal", "/@a", ["panel", "cards"], "cards")
+    planned, skipped = ss.plan_strategies(stats, "Normal", "/@a")
+    assert planned[0] == "cards" and skipped == ["panel"]
+
+
+def test_type_level_key_never_skips(no_explore):
+    stats = {}
+    for ch in ("/@a", "/@b", "/@c"):
+        for _ in range(ss.STRATEGY_MAX_FAILS):
+            win(stats, "Normal", ch, ["panel", "cards"], "cards")
+    assert "fail_streak" not in stats["Normal:*"]["panel"]
+    planned, skipped = ss.plan_strategies(stats, "Normal", "/@new")
+    assert planned[0] == "cards" and "panel" in planned and not skipped
+
+
+def test_outcome_without_winner_is_ignored():
+    stats = {}
+    ss.record_strategy_outcome(stats, {"video_type": "Normal", "channel": "/@a", "tried": list(ss.STRATEGIES), "winner": None})
+    ss.record_strategy_outcome(stats, {})
+    assert stats == {}
+
+
+def test_commit_merges_with_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(ss, "STRATEGY_STATS_FILE", str(tmp_path / "stats.json"))
+    stale = ss.load_strategy_stats()
+    ss.commit_strategy_outcome({"video_type": "Normal", "channel": "/@a", "tried": ["panel"], "winner": "panel"})
+    ss.commit_strategy_outcome({"video_type": "Shorts", "channel": "/@b", "tried": ["cards"], "winner": "cards"})
+    saved = ss.load_strategy_stats()
+    assert stale == {}
+    assert saved["Normal:/@a"]["panel"]["wins"] == 1
+    assert saved["Shorts:/@b"]["cards"]["wins"] == 1